@@ -1,15 +1,20 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from app.services.services import RAGService
 
 class OpenAIRAGController:
     def __init__(self, rag_service: RAGService):
         self.rag_service = rag_service
 
-    async def handle_query(self, question: str) -> Dict[str, Any]:
+    async def handle_query(self, question: str, session_id: Optional[str] = None, start_session: bool = False,
+                           client_id: Optional[str] = None, token_budget: Optional[int] = None,
+                           filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Handle query and call RAGService with Azure Chat provider."""
         if not self.rag_service.azure_chat_llm:
             raise ValueError("Azure OpenAI Chat LLM is not configured or failed initialization in RAGService.")
 
         # Call service with predetermined llm_provider
-        return await self.rag_service.answer_query(question, llm_provider="azure_chat")
+        return await self.rag_service.answer_query(question, llm_provider="azure_chat", session_id=session_id,
+                                                   start_session=start_session,
+                                                   client_id=client_id, token_budget=token_budget,
+                                                   filters=filters)
 
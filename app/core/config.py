@@ -34,10 +34,46 @@ class Settings(BaseSettings):
     CHROMA_DB_DIR: str = os.path.join(PROJECT_ROOT_DIR, "vector_store", "chroma_db_azure_multi")
     CHROMA_COLLECTION_NAME: str = "rag_azure_multi_pdf_collection"
 
+    # Boot from a single-file snapshot (scripts/snapshot_index.py) instead of CHROMA_DB_DIR
+    VECTOR_STORE_SNAPSHOT_PATH: str = os.getenv("VECTOR_STORE_SNAPSHOT_PATH", "")
+    VECTOR_STORE_SNAPSHOT_VERIFY: bool = os.getenv("VECTOR_STORE_SNAPSHOT_VERIFY", "false").lower() == "true"
+
+    # HNSW index settings (see scripts/tune_hnsw.py); unset values use Chroma defaults
+    HNSW_SPACE: str = os.getenv("HNSW_SPACE", "l2")
+    HNSW_M: Optional[int] = int(os.getenv("HNSW_M")) if os.getenv("HNSW_M") else None
+    HNSW_CONSTRUCTION_EF: Optional[int] = int(os.getenv("HNSW_CONSTRUCTION_EF")) if os.getenv("HNSW_CONSTRUCTION_EF") else None
+    HNSW_SEARCH_EF: Optional[int] = int(os.getenv("HNSW_SEARCH_EF")) if os.getenv("HNSW_SEARCH_EF") else None
+
     RETRIEVER_SEARCH_K: int = int(os.getenv("RETRIEVER_SEARCH_K", 4))
     LLM_TEMPERATURE: float = float(os.getenv("LLM_TEMPERATURE", 0.3))
     LLM_MAX_TOKENS: int = int(os.getenv("LLM_MAX_TOKENS", 800))
 
+    # Dedicated executor for blocking retrieval / embedding calls
+    RETRIEVAL_EXECUTOR_MAX_WORKERS: int = int(os.getenv("RETRIEVAL_EXECUTOR_MAX_WORKERS", 8))
+    RETRIEVAL_EXECUTOR_MAX_QUEUE: int = int(os.getenv("RETRIEVAL_EXECUTOR_MAX_QUEUE", 64))
+    RETRIEVAL_CALL_TIMEOUT_S: float = float(os.getenv("RETRIEVAL_CALL_TIMEOUT_S", 10))
+    EMBEDDINGS_NATIVE_ASYNC: bool = os.getenv("EMBEDDINGS_NATIVE_ASYNC", "true").lower() == "true"
+
+    # Token accounting and budgets
+    USAGE_EXPORT_PATH: str = os.getenv("USAGE_EXPORT_PATH", "")
+    USAGE_EXPORT_INTERVAL_S: float = float(os.getenv("USAGE_EXPORT_INTERVAL_S", 30))
+    CLIENT_TOKEN_BUDGET: int = int(os.getenv("CLIENT_TOKEN_BUDGET", 0))  # 0 = no per-client budget
+    CLIENT_TOKEN_BUDGET_WINDOW_S: float = float(os.getenv("CLIENT_TOKEN_BUDGET_WINDOW_S", 3600))
+    EMBEDDING_COST_PER_1K_TOKENS: float = float(os.getenv("EMBEDDING_COST_PER_1K_TOKENS", 0))
+    AZURE_CHAT_COST_PER_1K_PROMPT_TOKENS: float = float(os.getenv("AZURE_CHAT_COST_PER_1K_PROMPT_TOKENS", 0))
+    AZURE_CHAT_COST_PER_1K_COMPLETION_TOKENS: float = float(os.getenv("AZURE_CHAT_COST_PER_1K_COMPLETION_TOKENS", 0))
+    OPENROUTER_COST_PER_1K_PROMPT_TOKENS: float = float(os.getenv("OPENROUTER_COST_PER_1K_PROMPT_TOKENS", 0))
+    OPENROUTER_COST_PER_1K_COMPLETION_TOKENS: float = float(os.getenv("OPENROUTER_COST_PER_1K_COMPLETION_TOKENS", 0))
+
+    # Conversation sessions (follow-up queries)
+    SESSION_TTL_S: float = float(os.getenv("SESSION_TTL_S", 1800))
+    SESSION_MAX_SESSIONS: int = int(os.getenv("SESSION_MAX_SESSIONS", 1000))
+    SESSION_MAX_TURNS: int = int(os.getenv("SESSION_MAX_TURNS", 5))
+    SESSION_MAX_CACHED_CHUNKS: int = int(os.getenv("SESSION_MAX_CACHED_CHUNKS", 16))
+    SESSION_HISTORY_TOKEN_BUDGET: int = int(os.getenv("SESSION_HISTORY_TOKEN_BUDGET", 500))
+    SESSION_REUSE_THRESHOLD: float = float(os.getenv("SESSION_REUSE_THRESHOLD", 0.6))
+    SESSION_EXTEND_THRESHOLD: float = float(os.getenv("SESSION_EXTEND_THRESHOLD", 0.45))
+
 settings = Settings()
 
 # Validation
@@ -27,3 +27,27 @@ class RetrieverError(RAGServiceError):
 class QueryProcessingError(RAGServiceError):
     """Raised when query processing fails."""
     pass
+
+class ExecutorSaturatedError(RAGServiceError):
+    """Raised when the blocking-call executor queue is full."""
+    pass
+
+class ExecutorTimeoutError(RAGServiceError):
+    """Raised when a blocking call exceeds its timeout."""
+    pass
+
+class SessionNotFoundError(RAGServiceError):
+    """Raised when a session ID was not issued to this client or has expired."""
+    pass
+
+class TokenBudgetExceededError(RAGServiceError):
+    """Raised when a request cannot fit within its own token budget."""
+    pass
+
+class ClientBudgetExceededError(RAGServiceError):
+    """Raised when a client's token budget for the current window is used up."""
+    pass
+
+class MissingClientIdError(RAGServiceError):
+    """Raised when per-client budgets are enabled but the request has no client ID."""
+    pass
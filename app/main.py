@@ -12,10 +12,14 @@ async def lifespan(app: FastAPI):
     app.state.rag_service = None
 
     try:
-        print(f"ChromaDB Dir configuration from settings: {settings.CHROMA_DB_DIR}")
+        if settings.VECTOR_STORE_SNAPSHOT_PATH:
+            print(f"Vector store snapshot configuration from settings: {settings.VECTOR_STORE_SNAPSHOT_PATH}")
+        else:
+            print(f"ChromaDB Dir configuration from settings: {settings.CHROMA_DB_DIR}")
 
         chroma_db_file_path = os.path.join(settings.CHROMA_DB_DIR, "chroma.sqlite3")
-        if not os.path.isdir(settings.CHROMA_DB_DIR) or not os.path.exists(chroma_db_file_path):
+        if not settings.VECTOR_STORE_SNAPSHOT_PATH and (
+                not os.path.isdir(settings.CHROMA_DB_DIR) or not os.path.exists(chroma_db_file_path)):
             print(
                 f"CRITICAL ERROR (startup): ChromaDB directory or database file ('chroma.sqlite3') not found at: {settings.CHROMA_DB_DIR}")
             print("Make sure the 'scripts/ingest_data.py' script has been run and successfully created the database.")
@@ -33,6 +37,8 @@ async def lifespan(app: FastAPI):
     yield  # Application runs here
 
     print("Starting lifespan event: application shutdown...")
+    if getattr(app.state, 'rag_service', None) is not None:
+        app.state.rag_service.shutdown()
     if hasattr(app.state, 'rag_service'):
         app.state.rag_service = None  # Remove reference
     print("RAGService cleaned up (reference removed from app.state).")
@@ -40,3 +40,17 @@ async def readiness_check(rag_service: RAGServiceDep):
                services_status.get("vector_store") == "healthy"
     
     return {"ready": is_ready, "services": services_status}
+
+@router.get("/executor",
+           summary="Retrieval Executor Stats",
+           description="Report queue depth and saturation of the blocking retrieval executor.")
+async def executor_stats(rag_service: RAGServiceDep):
+    """Return retrieval executor statistics."""
+    return rag_service.executor_stats()
+
+@router.get("/usage",
+           summary="Token Usage",
+           description="Aggregated token usage and estimated cost per LLM provider.")
+async def usage_stats(rag_service: RAGServiceDep):
+    """Return aggregated token usage counters."""
+    return rag_service.usage_stats()
@@ -1,9 +1,12 @@
 # File: app/routes/open_router/route.py
 
-from fastapi import APIRouter, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, status
 from app.schemas.schemas import QueryRequest, QueryResponse
 from app.dependencies.dependencies import OpenRouterControllerDep
 from app.core.logging_config import logger
+from app.core.exceptions import (ClientBudgetExceededError, ExecutorSaturatedError, ExecutorTimeoutError,
+                                 MissingClientIdError, SessionNotFoundError, TokenBudgetExceededError)
 
 router = APIRouter()
 
@@ -13,15 +16,32 @@ router = APIRouter()
              description="Send a question to the RAG system, using OpenRouter LLM for answer generation.")
 async def ask_rag_openrouter(
     request_data: QueryRequest,
-    controller: OpenRouterControllerDep
+    controller: OpenRouterControllerDep,
+    x_client_id: Optional[str] = Header(None, description="Client identifier for per-client token budgets")
 ):
     if not request_data.question.strip():
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Question cannot be empty.")
 
     try:
         logger.info(f"Receiving query for OpenRouter LLM: {request_data.question}")
-        result = await controller.handle_query(request_data.question)
+        filters = request_data.filters.model_dump(exclude_none=True) if request_data.filters else None
+        result = await controller.handle_query(request_data.question, session_id=request_data.session_id,
+                                               start_session=request_data.start_session,
+                                               client_id=x_client_id, token_budget=request_data.token_budget,
+                                               filters=filters)
         return QueryResponse(**result)
+    except MissingClientIdError as mce:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(mce))
+    except SessionNotFoundError as sne:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(sne))
+    except ClientBudgetExceededError as cbe:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(cbe))
+    except TokenBudgetExceededError as be:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(be))
+    except ExecutorSaturatedError as se:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(se))
+    except ExecutorTimeoutError as te:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(te))
     except ValueError as ve:
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(ve))
     except RuntimeError as re:
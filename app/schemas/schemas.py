@@ -1,9 +1,33 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
+class RetrievalFilters(BaseModel):
+    sources: Optional[List[str]] = Field(None, min_length=1, description="Only search these source files")
+    page_min: Optional[int] = Field(None, ge=0, description="Lowest page to search, as reported in sources")
+    page_max: Optional[int] = Field(None, ge=0, description="Highest page to search, as reported in sources")
+    document_types: Optional[List[str]] = Field(None, min_length=1,
+                                                description="Only search these document types, as mapped in "
+                                                            "data/document_types.json (e.g. 'guideline'); "
+                                                            "unlisted files are 'unclassified'")
+
+    @model_validator(mode='after')
+    def validate_page_range(self):
+        if self.page_min is not None and self.page_max is not None and self.page_min > self.page_max:
+            raise ValueError('page_min cannot be greater than page_max')
+        return self
+
 class QueryRequest(BaseModel):
     question: str = Field(..., min_length=1, max_length=1000, description="The question to ask the RAG system")
+    session_id: Optional[str] = Field(None, min_length=1, max_length=128,
+                                      description="Session ID from query_metadata.session_id of an earlier "
+                                                  "answer, for follow-up questions")
+    start_session: bool = Field(False, description="Start a new conversation session; its ID is returned "
+                                                   "in query_metadata.session_id")
+    token_budget: Optional[int] = Field(None, gt=0,
+                                        description="Optional token budget for this request "
+                                                    "(embedding + prompt + completion tokens)")
+    filters: Optional[RetrievalFilters] = Field(None, description="Optional filters applied inside the vector search")
     
     @field_validator('question')
     def validate_question(cls, v):
@@ -11,6 +35,12 @@ class QueryRequest(BaseModel):
             raise ValueError('Question cannot be empty or only whitespace')
         return v.strip()
 
+    @model_validator(mode='after')
+    def validate_session(self):
+        if self.start_session and self.session_id:
+            raise ValueError('Send either start_session or session_id, not both')
+        return self
+
 class SourceInfo(BaseModel):
     source_file: str = Field(..., description="Source file name")
     page: str = Field(..., description="Page number or identifier")
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Set
+from app.core.logging_config import logger
+from app.core.exceptions import ExecutorSaturatedError, ExecutorTimeoutError
+
+
+class BlockingCallExecutor:
+    """Dedicated, bounded thread pool for blocking vector-store and embedding calls.
+
+    Keeps synchronous backend work (e.g. Chroma similarity search) off the default
+    event-loop executor, caps how many calls may wait for a worker and applies a
+    per-call timeout.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, call_timeout_s: float):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.call_timeout_s = call_timeout_s
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._completed = 0
+        self._failed = 0
+        self._started = 0
+        self._total_wait_ms = 0.0
+        # Futures whose caller timed out; they are not counted as completed when they finish.
+        self._abandoned: Set["Future[Any]"] = set()
+
+    def _track(self, func: Callable[..., Any], submitted_at: float) -> Any:
+        with self._lock:
+            self._running += 1
+            self._started += 1
+            self._total_wait_ms += (time.perf_counter() - submitted_at) * 1000
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    async def run(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """Run a blocking callable on the pool, enforcing the queue limit and timeout."""
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturatedError(
+                    f"Executor '{self.name}' is saturated ({self._in_flight} calls in flight)")
+            self._in_flight += 1
+
+        try:
+            future = self._pool.submit(self._track, partial(func, *args, **kwargs), time.perf_counter())
+        except BaseException:
+            # e.g. RuntimeError after shutdown(): the call never reached the pool.
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        # Released from the pool's future, so a call keeps its slot until the worker finishes
+        # (or until it is cancelled before starting), not when the caller gives up.
+        future.add_done_callback(self._release)
+        waiter = asyncio.wrap_future(future)
+
+        call_timeout = self.call_timeout_s if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter), timeout=call_timeout or None)
+        except asyncio.TimeoutError as e:
+            with self._lock:
+                self._timed_out += 1
+                if not future.done():
+                    self._abandoned.add(future)
+            # Drops the call if it is still queued, so a burst of timed-out calls does not
+            # keep the workers busy after their callers are gone. Running calls are not interrupted.
+            cancelled = future.cancel()
+            # Nobody awaits the waiter any more; consume its outcome to avoid "never retrieved" warnings.
+            waiter.add_done_callback(lambda f: f.cancelled() or f.exception())
+            logger.warning(f"Executor '{self.name}': call {getattr(func, '__name__', func)} exceeded "
+                           f"{call_timeout}s{' and was dropped from the queue' if cancelled else ''}")
+            raise ExecutorTimeoutError(f"Blocking call timed out after {call_timeout}s") from e
+
+    def _release(self, future: "Future[Any]") -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if future in self._abandoned:
+                self._abandoned.discard(future)
+            elif future.cancelled() or future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, saturation and counters for monitoring."""
+        with self._lock:
+            queued = max(self._in_flight - self._running, 0)
+            capacity = self.max_workers + self.max_queue
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": queued,
+                "in_flight": self._in_flight,
+                "saturation": round(self._in_flight / capacity, 3) if capacity else 1.0,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "avg_queue_wait_ms": round(self._total_wait_ms / self._started, 3) if self._started else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        logger.info(f"Executor '{self.name}' shut down")
@@ -1,21 +1,52 @@
+import asyncio
 import os
 import time
+from operator import itemgetter
 from langchain_openai import AzureOpenAIEmbeddings, ChatOpenAI, AzureChatOpenAI
 from langchain_chroma import Chroma  # Updated import
 from langchain.prompts import PromptTemplate
-from langchain_core.runnables import RunnablePassthrough, RunnableParallel
+from langchain_core.runnables import RunnablePassthrough, RunnableParallel, RunnableLambda
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.documents import Document
-from typing import List, Dict, Any, Literal, Optional
+from langchain_core.callbacks import UsageMetadataCallbackHandler
+from typing import List, Dict, Any, Literal, Optional, Tuple
 from app.core.config import settings
 from app.core.logging_config import logger
 from app.core.exceptions import (
     ConfigurationError, EmbeddingModelError, VectorStoreError,
-    LLMProviderError, RetrieverError, QueryProcessingError
+    LLMProviderError, RetrieverError, QueryProcessingError,
+    ExecutorSaturatedError, ExecutorTimeoutError, SessionNotFoundError, TokenBudgetExceededError,
+    ClientBudgetExceededError, MissingClientIdError
 )
+from app.services.executor import BlockingCallExecutor
+from app.services.snapshot import SnapshotVectorStore
+from app.services.sessions import ConversationSession, SessionStore, cosine_similarity
+from app.services.usage import UsageRecord, UsageTracker, count_tokens, estimate_cost, provider_usage
 
 LLMProviderType = Literal["azure_chat", "openrouter"]
 
+# Values Chroma uses when a collection is created without the corresponding hnsw:* metadata
+CHROMA_HNSW_DEFAULTS = {"hnsw:space": "l2", "hnsw:M": 16, "hnsw:construction_ef": 100, "hnsw:search_ef": 10}
+
+RAG_PROMPT_TEMPLATE = """
+        You are a very helpful AI assistant. Use the following context snippets to answer the user's question.
+        The context comes from various documents, sources and pages will be listed.
+        Answer the question based only on the provided context.
+        If the information is not available in the context, say you cannot find the answer in the provided documents.
+        Answer clearly and concisely.
+
+        Conversation so far:
+        {history}
+
+        Context:
+        {context}
+
+        Question:
+        {question}
+
+        Answer (based on the context above):
+        """
+
 class RAGService:
     def __init__(self):
         logger.info("Initializing RAGService...")
@@ -25,6 +56,9 @@ class RAGService:
     def _initialize_components(self):
         """Initialize all RAGService components with proper error handling."""
         self._validate_configuration()
+        self._initialize_executor()
+        self._initialize_session_store()
+        self._initialize_usage_tracker()
         self._initialize_embeddings()
         self._initialize_vector_store()
         self._initialize_llm_clients()
@@ -36,11 +70,46 @@ class RAGService:
                     settings.AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME]):
             raise ConfigurationError("Azure OpenAI Embeddings configuration is incomplete")
 
+        if settings.VECTOR_STORE_SNAPSHOT_PATH:
+            if not os.path.isfile(settings.VECTOR_STORE_SNAPSHOT_PATH):
+                raise ConfigurationError(
+                    f"Vector store snapshot not found at: {settings.VECTOR_STORE_SNAPSHOT_PATH}")
+            return
+
         chroma_db_file_path = os.path.join(settings.CHROMA_DB_DIR, "chroma.sqlite3")
         if not os.path.isdir(settings.CHROMA_DB_DIR) or not os.path.exists(chroma_db_file_path):
             raise ConfigurationError(
                 f"ChromaDB database not found at: {settings.CHROMA_DB_DIR}. Run 'scripts/ingest_data.py'")
 
+    def _initialize_executor(self):
+        """Initialize the dedicated executor for blocking retrieval calls."""
+        self.retrieval_executor = BlockingCallExecutor(
+            name="retrieval",
+            max_workers=settings.RETRIEVAL_EXECUTOR_MAX_WORKERS,
+            max_queue=settings.RETRIEVAL_EXECUTOR_MAX_QUEUE,
+            call_timeout_s=settings.RETRIEVAL_CALL_TIMEOUT_S,
+        )
+        logger.info(f"Retrieval executor initialized ({settings.RETRIEVAL_EXECUTOR_MAX_WORKERS} workers, "
+                    f"queue limit {settings.RETRIEVAL_EXECUTOR_MAX_QUEUE})")
+
+    def _initialize_session_store(self):
+        """Initialize the in-memory conversation session store."""
+        self.session_store = SessionStore(
+            max_sessions=settings.SESSION_MAX_SESSIONS,
+            ttl_s=settings.SESSION_TTL_S,
+            max_turns=settings.SESSION_MAX_TURNS,
+            max_chunks=settings.SESSION_MAX_CACHED_CHUNKS,
+        )
+
+    def _initialize_usage_tracker(self):
+        """Initialize token usage accounting and the optional JSONL export."""
+        self.usage_tracker = UsageTracker(
+            export_path=settings.USAGE_EXPORT_PATH,
+            export_interval_s=settings.USAGE_EXPORT_INTERVAL_S,
+            client_budget=settings.CLIENT_TOKEN_BUDGET,
+            client_window_s=settings.CLIENT_TOKEN_BUDGET_WINDOW_S,
+        )
+
     def _initialize_embeddings(self):
         """Initialize embedding model with error handling."""
         try:
@@ -55,19 +124,67 @@ class RAGService:
             logger.error(f"Failed to initialize Azure Embeddings model: {e}")
             raise EmbeddingModelError(f"Failed to initialize Azure Embeddings model: {e}") from e
 
+    def _hnsw_metadata(self) -> Dict[str, Any]:
+        """Collection metadata carrying the configured HNSW parameters."""
+        metadata: Dict[str, Any] = {"hnsw:space": settings.HNSW_SPACE}
+        if settings.HNSW_M:
+            metadata["hnsw:M"] = settings.HNSW_M
+        if settings.HNSW_CONSTRUCTION_EF:
+            metadata["hnsw:construction_ef"] = settings.HNSW_CONSTRUCTION_EF
+        if settings.HNSW_SEARCH_EF:
+            metadata["hnsw:search_ef"] = settings.HNSW_SEARCH_EF
+        return metadata
+
     def _initialize_vector_store(self):
         """Initialize vector store with error handling."""
+        if settings.VECTOR_STORE_SNAPSHOT_PATH:
+            self._initialize_snapshot_store()
+            return
         try:
             self.vector_store = Chroma(
                 collection_name=settings.CHROMA_COLLECTION_NAME,
                 embedding_function=self.embeddings_model,
-                persist_directory=settings.CHROMA_DB_DIR
+                persist_directory=settings.CHROMA_DB_DIR,
+                collection_metadata=self._hnsw_metadata()
             )
             logger.info(f"ChromaDB vector store successfully loaded from: {settings.CHROMA_DB_DIR}")
+            self._check_hnsw_settings()
         except Exception as e:
             logger.error(f"Failed to load ChromaDB vector store: {e}")
             raise VectorStoreError(f"Failed to load ChromaDB vector store: {e}") from e
 
+    def _initialize_snapshot_store(self):
+        """Boot the vector store from a single-file snapshot instead of a Chroma directory."""
+        start = time.perf_counter()
+        try:
+            self.vector_store = SnapshotVectorStore.from_file(
+                settings.VECTOR_STORE_SNAPSHOT_PATH,
+                embedding_function=self.embeddings_model,
+                verify=settings.VECTOR_STORE_SNAPSHOT_VERIFY
+            )
+            snapshot = self.vector_store.snapshot
+            logger.info(f"Snapshot vector store loaded from {settings.VECTOR_STORE_SNAPSHOT_PATH}: "
+                        f"{snapshot.header['count']} chunks, {snapshot.header['dtype']}, "
+                        f"memory-mapped={snapshot.memory_mapped}, "
+                        f"{(time.perf_counter() - start) * 1000:.1f}ms")
+        except Exception as e:
+            logger.error(f"Failed to load vector store snapshot: {e}")
+            raise VectorStoreError(f"Failed to load vector store snapshot: {e}") from e
+
+    def _check_hnsw_settings(self):
+        """Warn when the configured HNSW_* values differ from those the collection was built with.
+
+        Chroma copies the HNSW parameters into the index segment when the collection is
+        created, so none of them (search_ef included) can be changed on an existing
+        collection; a re-ingest or a snapshot re-import is needed.
+        """
+        collection_metadata = self.vector_store._collection.metadata or {}
+        for key, value in self._hnsw_metadata().items():
+            built_with = collection_metadata.get(key, CHROMA_HNSW_DEFAULTS.get(key))
+            if built_with != value:
+                logger.warning(f"Collection was built with {key}={built_with} but config sets {value}; "
+                               f"re-run 'scripts/ingest_data.py' (or re-import a snapshot) to apply it")
+
     def _initialize_llm_clients(self):
         """Initialize LLM clients with error handling."""
         self.azure_chat_llm: Optional[AzureChatOpenAI] = None
@@ -123,6 +240,157 @@ class RAGService:
             logger.error(f"Failed to create retriever: {e}")
             raise RetrieverError(f"Failed to create retriever: {e}") from e
 
+    @staticmethod
+    def _build_where(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Translate retrieval filters into a Chroma 'where' clause (None when unfiltered)."""
+        if not filters:
+            return None
+        clauses = []
+        if filters.get("sources"):
+            clauses.append({"source": {"$in": filters["sources"]}})
+        if filters.get("page_min") is not None:
+            clauses.append({"page": {"$gte": filters["page_min"]}})
+        if filters.get("page_max") is not None:
+            clauses.append({"page": {"$lte": filters["page_max"]}})
+        if filters.get("document_types"):
+            clauses.append({"document_type": {"$in": filters["document_types"]}})
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    def _retrieve(self, inputs: Dict[str, Any]) -> List[Document]:
+        """Synchronous retrieval path (used by invoke); does not consult sessions."""
+        inputs.setdefault("trace", {})["embedding_tokens"] = count_tokens(inputs["question"])
+        where = inputs.get("where")
+        if where is None:
+            return self.retriever.invoke(inputs["question"])
+        return self.vector_store.similarity_search(inputs["question"], k=settings.RETRIEVER_SEARCH_K, filter=where)
+
+    async def _aembed_query(self, text: str) -> List[float]:
+        """Embed a query with the native async client, or on the executor if disabled."""
+        if not settings.EMBEDDINGS_NATIVE_ASYNC:
+            return await self.retrieval_executor.run(self.embeddings_model.embed_query, text)
+        try:
+            return await asyncio.wait_for(
+                self.embeddings_model.aembed_query(text),
+                timeout=settings.RETRIEVAL_CALL_TIMEOUT_S or None)
+        except asyncio.TimeoutError as e:
+            raise ExecutorTimeoutError(
+                f"Query embedding timed out after {settings.RETRIEVAL_CALL_TIMEOUT_S}s") from e
+
+    def _search_with_embeddings(self, query_embedding: List[float], k: int,
+                                where: Optional[Dict[str, Any]] = None) -> List[Tuple[Document, List[float]]]:
+        """Similarity search returning each hit with its stored embedding (blocking).
+
+        The 'where' clause is applied inside the vector store search, not on its results.
+        """
+        docs = self.vector_store.similarity_search_by_vector(query_embedding, k=k, filter=where)
+        ids = [doc.id for doc in docs if doc.id]
+        embeddings: Dict[str, List[float]] = {}
+        if ids:
+            stored = self.vector_store.get(ids=ids, include=["embeddings"])
+            embeddings = dict(zip(stored["ids"], stored["embeddings"]))
+        return [(doc, embeddings.get(doc.id)) for doc in docs]
+
+    def _get_chunks_by_id(self, chunk_ids: List[str]) -> Dict[str, Document]:
+        """Fetch cached chunks by ID without a similarity search (blocking)."""
+        stored = self.vector_store.get(ids=chunk_ids, include=["documents", "metadatas"])
+        return {
+            chunk_id: Document(id=chunk_id, page_content=text, metadata=metadata or {})
+            for chunk_id, text, metadata in zip(stored["ids"], stored["documents"], stored["metadatas"])
+        }
+
+    @staticmethod
+    def _search_text(question: str, session: Optional[ConversationSession]) -> str:
+        """Text embedded for retrieval; follow-ups carry the previous question for context."""
+        if session is not None and session.last_question:
+            return f"{session.last_question}\n{question}"
+        return question
+
+    async def _aretrieve(self, inputs: Dict[str, Any]) -> List[Document]:
+        """Async retrieval: native async embedding, Chroma calls on the dedicated executor.
+
+        With a session, the follow-up is embedded together with the previous question and
+        the session's cached chunks are reused, reused-and-extended, or replaced depending
+        on how close they are to the new query.
+        """
+        question = inputs["question"]
+        session: Optional[ConversationSession] = inputs.get("session")
+        where = inputs.get("where")
+        trace: Dict[str, Any] = inputs.setdefault("trace", {})
+        k = settings.RETRIEVER_SEARCH_K
+
+        search_text = self._search_text(question, session)
+        trace["embedding_tokens"] = count_tokens(search_text)
+        query_embedding = await self._aembed_query(search_text)
+
+        # Cached chunks were retrieved without this request's filters, so filtered queries search afresh.
+        cached = session.rank_cached_chunks(query_embedding)[:k] if session is not None and where is None else []
+        cached_score = sum(score for _, score in cached) / len(cached) if cached else 0.0
+
+        if cached and cached_score >= settings.SESSION_REUSE_THRESHOLD:
+            mode = "reuse"
+            by_id = await self.retrieval_executor.run(self._get_chunks_by_id, [cid for cid, _ in cached])
+            docs = [by_id[cid] for cid, _ in cached if cid in by_id]
+            chunk_embeddings = {cid: session.chunk_embeddings[cid] for cid, _ in cached if cid in by_id}
+        else:
+            hits = await self.retrieval_executor.run(self._search_with_embeddings, query_embedding, k, where)
+            docs = [doc for doc, _ in hits]
+            chunk_embeddings = {doc.id: emb for doc, emb in hits if doc.id and emb is not None}
+            mode = "fresh"
+            if cached and cached_score >= settings.SESSION_EXTEND_THRESHOLD:
+                mode = "reuse_extend"
+                missing = [cid for cid, _ in cached if cid not in chunk_embeddings]
+                by_id = await self.retrieval_executor.run(self._get_chunks_by_id, missing) if missing else {}
+                merged = [(doc, cosine_similarity(query_embedding, chunk_embeddings[doc.id]))
+                          for doc in docs if doc.id in chunk_embeddings]
+                cached_scores = dict(cached)
+                for cid in missing:
+                    if cid in by_id:
+                        merged.append((by_id[cid], cached_scores[cid]))
+                        chunk_embeddings[cid] = session.chunk_embeddings[cid]
+                docs = [doc for doc, _ in sorted(merged, key=lambda item: -item[1])[:k]]
+
+        trace["retrieval_mode"] = mode
+        trace["chunk_embeddings"] = {doc.id: chunk_embeddings[doc.id] for doc in docs if doc.id in chunk_embeddings}
+        return docs
+
+    def _fit_context_to_budget(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Drop the lowest-ranked context chunks until the prompt fits the token budget.
+
+        LLM_MAX_TOKENS is reserved for the completion. Also records the estimated prompt
+        size, used when the provider does not report usage, and narrows the trace's chunk
+        embeddings to the kept chunks so the session caches only what the answer used.
+        """
+        trace = inputs["trace"]
+        docs = list(inputs["context_docs"])
+        budget = inputs.get("token_budget")
+
+        def prompt_tokens(context_docs: List[Document]) -> int:
+            return count_tokens(RAG_PROMPT_TEMPLATE.format(
+                context=self._format_docs_for_context(context_docs),
+                question=inputs["question"], history=inputs["history"]))
+
+        tokens = prompt_tokens(docs)
+        if budget is not None:
+            available = budget - trace.get("embedding_tokens", 0) - settings.LLM_MAX_TOKENS
+            while docs and tokens > available:
+                docs.pop()
+                tokens = prompt_tokens(docs)
+            if tokens > available or (inputs["context_docs"] and not docs):
+                raise TokenBudgetExceededError(
+                    f"Token budget of {budget} is too small for this question with any retrieved context "
+                    f"({settings.LLM_MAX_TOKENS} tokens are reserved for the answer)")
+
+        trace["context_docs_trimmed"] = len(inputs["context_docs"]) - len(docs)
+        trace["prompt_tokens_estimate"] = tokens
+        # Only chunks that reached the prompt are cached for follow-up questions.
+        kept_ids = {doc.id for doc in docs}
+        trace["chunk_embeddings"] = {chunk_id: embedding
+                                     for chunk_id, embedding in trace.get("chunk_embeddings", {}).items()
+                                     if chunk_id in kept_ids}
+        return {**inputs, "context_docs": docs}
+
     def _format_docs_for_context(self, docs: List[Document]) -> str:
         context_parts = []
         for doc in docs:
@@ -135,27 +403,17 @@ class RAGService:
         if llm_client is None:
             raise ValueError("LLM client not provided or not initialized for _build_rag_chain.")
 
-        prompt_template_str = """
-        You are a very helpful AI assistant. Use the following context snippets to answer the user's question.
-        The context comes from various documents, sources and pages will be listed.
-        Answer the question based only on the provided context.
-        If the information is not available in the context, say you cannot find the answer in the provided documents.
-        Answer clearly and concisely.
-
-        Context:
-        {context}
-
-        Question:
-        {question}
-
-        Answer (based on the context above):
-        """
-        prompt = PromptTemplate.from_template(prompt_template_str)
+        prompt = PromptTemplate.from_template(RAG_PROMPT_TEMPLATE)
 
         return (
                 RunnableParallel(
-                    {"context_docs": self.retriever, "question": RunnablePassthrough()}
+                    {"context_docs": RunnableLambda(self._retrieve, afunc=self._aretrieve),
+                     "question": itemgetter("question"),
+                     "history": itemgetter("history"),
+                     "token_budget": itemgetter("token_budget"),
+                     "trace": itemgetter("trace")}
                 )
+                | RunnableLambda(self._fit_context_to_budget)
                 | RunnableParallel(
             {
                 "answer": (
@@ -170,18 +428,75 @@ class RAGService:
         )
         )
 
-    async def answer_query(self, question: str, llm_provider: LLMProviderType) -> Dict[str, Any]:
+    async def answer_query(self, question: str, llm_provider: LLMProviderType,
+                           session_id: Optional[str] = None, start_session: bool = False,
+                           client_id: Optional[str] = None,
+                           token_budget: Optional[int] = None,
+                           filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Process query with enhanced error handling and timing."""
         start_time = time.time()
-        
+        trace: Dict[str, Any] = {}
+        usage_handler = UsageMetadataCallbackHandler()
+        # True when the client's remaining budget, not the request's own token_budget, is the limit.
+        client_limited = False
+
         try:
             chosen_llm = self._get_llm_client(llm_provider)
             rag_chain = self._build_rag_chain(chosen_llm)
+
+            if settings.CLIENT_TOKEN_BUDGET and not client_id:
+                # Pooling header-less callers would let one of them exhaust the budget for all the others.
+                raise MissingClientIdError("X-Client-ID header is required when per-client token budgets are enabled")
+            remaining = self.usage_tracker.remaining_client_budget(client_id) if client_id else None
+            if remaining is not None:
+                if remaining <= 0:
+                    raise ClientBudgetExceededError(
+                        f"Client token budget of {settings.CLIENT_TOKEN_BUDGET} per "
+                        f"{settings.CLIENT_TOKEN_BUDGET_WINDOW_S:.0f}s is exhausted")
+                client_limited = token_budget is None or remaining < token_budget
+                token_budget = min(token_budget, remaining) if token_budget else remaining
+
+            session = None
+            if session_id:
+                session = self.session_store.get(session_id, owner=client_id)
+                if session is None:
+                    raise SessionNotFoundError(
+                        f"Session '{session_id}' does not exist or has expired; start a new one with start_session")
+            history, history_tokens = ("", 0)
+            if session is not None:
+                history, history_tokens = session.render_history(settings.SESSION_HISTORY_TOKEN_BUDGET)
+
+            if token_budget is not None:
+                # Everything except the retrieved context is known now, so budgets that cannot fit
+                # even an empty context are rejected before paying for the embedding and the search.
+                minimum = (count_tokens(self._search_text(question, session))
+                           + count_tokens(RAG_PROMPT_TEMPLATE.format(context="", question=question,
+                                                                     history=history or "None"))
+                           + settings.LLM_MAX_TOKENS)
+                if minimum > token_budget:
+                    raise TokenBudgetExceededError(
+                        f"Token budget of {token_budget} is too small for this question: at least {minimum} "
+                        f"tokens are needed ({settings.LLM_MAX_TOKENS} are reserved for the answer)")
+
+            if start_session:
+                session = self.session_store.create(owner=client_id)
             
             logger.info(f"Processing query with {llm_provider}: {question[:100]}...")
-            result = await rag_chain.ainvoke(question)
+            result = await rag_chain.ainvoke({
+                "question": question,
+                "history": history or "None",
+                "session": session,
+                "where": self._build_where(filters),
+                "token_budget": token_budget,
+                "trace": trace,
+            }, config={"callbacks": [usage_handler]})
             
             processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
+            usage = self._record_usage(llm_provider, client_id, trace, usage_handler,
+                                       result.get("answer", ""), processing_time)
+
+            if session is not None:
+                session.add_turn(question, result.get("answer", ""), trace.get("chunk_embeddings", {}))
             
             formatted_sources = self._format_sources(result.get("sources", []))
             
@@ -191,18 +506,92 @@ class RAGService:
                 "query_metadata": {
                     "llm_provider": llm_provider,
                     "retriever_k": settings.RETRIEVER_SEARCH_K,
-                    "processing_time_ms": processing_time
+                    "processing_time_ms": processing_time,
+                    "session_id": session.session_id if session is not None else None,
+                    "retrieval_mode": trace.get("retrieval_mode", "fresh"),
+                    "history_tokens": history_tokens,
+                    "token_budget": token_budget,
+                    "filters": filters,
+                    "usage": usage
                 }
             }
             
             logger.info(f"Query processed successfully in {processing_time:.2f}ms using {llm_provider}")
             return response
             
+        except ClientBudgetExceededError as e:
+            logger.warning(f"Client budget exhausted with {llm_provider}: {e}")
+            raise
+        except MissingClientIdError as e:
+            logger.warning(f"Rejected query with {llm_provider}: {e}")
+            raise
+        except TokenBudgetExceededError as e:
+            if trace.get("embedding_tokens"):
+                # Rejected after retrieval: the query embedding was already paid for.
+                self._record_usage(llm_provider, client_id, trace, usage_handler, "",
+                                   (time.time() - start_time) * 1000)
+            logger.warning(f"Token budget exceeded with {llm_provider}: {e}")
+            if client_limited:
+                raise ClientBudgetExceededError(
+                    f"Remaining client token budget is too small for this question: {e}") from e
+            raise
+        except SessionNotFoundError as e:
+            logger.warning(f"Rejected query with {llm_provider}: {e}")
+            raise
+        except (ExecutorSaturatedError, ExecutorTimeoutError) as e:
+            processing_time = (time.time() - start_time) * 1000
+            logger.warning(f"Retrieval backpressure with {llm_provider} (took {processing_time:.2f}ms): {e}")
+            raise
         except Exception as e:
             processing_time = (time.time() - start_time) * 1000
             logger.error(f"Error processing query with {llm_provider} (took {processing_time:.2f}ms): {e}")
             raise QueryProcessingError(f"Failed to process query with {llm_provider} LLM") from e
 
+    def _record_usage(self, llm_provider: LLMProviderType, client_id: Optional[str], trace: Dict[str, Any],
+                      usage_handler: UsageMetadataCallbackHandler, answer: str,
+                      processing_time: float) -> Dict[str, Any]:
+        """Build the per-request usage report and feed it to the usage tracker."""
+        reported = provider_usage(usage_handler.usage_metadata)
+        if reported is not None:
+            prompt_tokens, completion_tokens = reported
+            usage_source = "provider"
+        else:
+            prompt_tokens, completion_tokens = trace.get("prompt_tokens_estimate", 0), count_tokens(answer)
+            usage_source = "estimate"
+        embedding_tokens = trace.get("embedding_tokens", 0)
+
+        record = UsageRecord(
+            llm_provider=llm_provider,
+            client_id=client_id,
+            embedding_tokens=embedding_tokens,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            usage_source=usage_source,
+            estimated_cost_usd=estimate_cost(self._pricing(llm_provider), embedding_tokens,
+                                             prompt_tokens, completion_tokens),
+            processing_time_ms=processing_time,
+        )
+        self.usage_tracker.record(record)
+        return {
+            "embedding_tokens": record.embedding_tokens,
+            "prompt_tokens": record.prompt_tokens,
+            "completion_tokens": record.completion_tokens,
+            "total_tokens": record.total_tokens,
+            "usage_source": record.usage_source,
+            "estimated_cost_usd": record.estimated_cost_usd,
+            "context_docs_trimmed": trace.get("context_docs_trimmed", 0),
+        }
+
+    def _pricing(self, llm_provider: LLMProviderType) -> Dict[str, float]:
+        """Per-1K-token prices for the embedding model and the chosen LLM provider."""
+        if llm_provider == "azure_chat":
+            prompt, completion = (settings.AZURE_CHAT_COST_PER_1K_PROMPT_TOKENS,
+                                  settings.AZURE_CHAT_COST_PER_1K_COMPLETION_TOKENS)
+        else:
+            prompt, completion = (settings.OPENROUTER_COST_PER_1K_PROMPT_TOKENS,
+                                  settings.OPENROUTER_COST_PER_1K_COMPLETION_TOKENS)
+        return {"embedding": settings.EMBEDDING_COST_PER_1K_TOKENS, "prompt": prompt, "completion": completion}
+
     def _get_llm_client(self, llm_provider: LLMProviderType) -> Any:
         """Get LLM client with validation."""
         if llm_provider == "azure_chat":
@@ -258,3 +647,16 @@ class RAGService:
 
         return health_status
 
+    def executor_stats(self) -> Dict[str, Any]:
+        """Report queue depth and saturation of the retrieval executor."""
+        return self.retrieval_executor.stats()
+
+    def usage_stats(self) -> Dict[str, Any]:
+        """Aggregated token usage counters per LLM provider."""
+        return self.usage_tracker.stats()
+
+    def shutdown(self):
+        """Release background resources."""
+        self.retrieval_executor.shutdown()
+        self.usage_tracker.shutdown()
+
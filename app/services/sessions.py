@@ -0,0 +1,129 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+import numpy as np
+from app.core.logging_config import logger
+from app.services.usage import count_tokens
+
+
+@dataclass
+class SessionTurn:
+    question: str
+    answer_summary: str
+    chunk_ids: List[str]
+
+
+@dataclass
+class ConversationSession:
+    session_id: str
+    max_turns: int
+    max_chunks: int
+    owner: Optional[str] = None  # X-Client-ID that started the session
+    created_at: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+    turns: Deque[SessionTurn] = field(default_factory=deque)
+    # chunk_id -> unit-normalised float32 embedding, oldest first
+    chunk_embeddings: "OrderedDict[str, np.ndarray]" = field(default_factory=OrderedDict)
+
+    @property
+    def last_question(self) -> Optional[str]:
+        return self.turns[-1].question if self.turns else None
+
+    def add_turn(self, question: str, answer: str, chunk_embeddings: Dict[str, List[float]]):
+        """Record a finished turn and its retrieved chunks, evicting the oldest beyond the limits."""
+        summary = " ".join(answer.split())
+        if len(summary) > 240:
+            summary = summary[:240] + "..."
+        self.turns.append(SessionTurn(question=question, answer_summary=summary,
+                                      chunk_ids=list(chunk_embeddings.keys())))
+        while len(self.turns) > self.max_turns:
+            self.turns.popleft()
+
+        for chunk_id, embedding in chunk_embeddings.items():
+            self.chunk_embeddings.pop(chunk_id, None)
+            self.chunk_embeddings[chunk_id] = _normalise(embedding)
+        while len(self.chunk_embeddings) > self.max_chunks:
+            self.chunk_embeddings.popitem(last=False)
+
+    def rank_cached_chunks(self, query_embedding: List[float]) -> List[Tuple[str, float]]:
+        """Return cached chunk IDs with their cosine similarity to the query, best first."""
+        if not self.chunk_embeddings:
+            return []
+        ids = list(self.chunk_embeddings.keys())
+        matrix = np.stack([self.chunk_embeddings[i] for i in ids])
+        scores = matrix @ _normalise(query_embedding)
+        order = np.argsort(-scores)
+        return [(ids[i], float(scores[i])) for i in order]
+
+    def render_history(self, token_budget: int) -> Tuple[str, int]:
+        """Render the running summary of previous turns, newest kept first, within the token budget."""
+        lines: List[str] = []
+        used = 0
+        for turn in reversed(self.turns):
+            line = f"Q: {turn.question}\nA: {turn.answer_summary}"
+            tokens = count_tokens(line)
+            if used + tokens > token_budget:
+                break
+            lines.append(line)
+            used += tokens
+        return "\n".join(reversed(lines)), used
+
+
+def _normalise(vector: List[float]) -> np.ndarray:
+    arr = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(arr)
+    return arr / norm if norm else arr
+
+
+def cosine_similarity(a: List[float], b: List[float]) -> float:
+    return float(_normalise(a) @ _normalise(b))
+
+
+class SessionStore:
+    """In-memory conversation sessions with TTL expiry and LRU eviction."""
+
+    def __init__(self, max_sessions: int, ttl_s: float, max_turns: int, max_chunks: int):
+        self.max_sessions = max_sessions
+        self.ttl_s = ttl_s
+        self.max_turns = max_turns
+        self.max_chunks = max_chunks
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, owner: Optional[str] = None) -> ConversationSession:
+        """Start a session under a server-issued random ID."""
+        session = ConversationSession(session_id=uuid.uuid4().hex, max_turns=self.max_turns,
+                                      max_chunks=self.max_chunks, owner=owner)
+        with self._lock:
+            self._expire(session.created_at)
+            self._sessions[session.session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                evicted_id, _ = self._sessions.popitem(last=False)
+                logger.debug(f"Session store: evicted least recently used session {evicted_id}")
+        return session
+
+    def get(self, session_id: str, owner: Optional[str] = None) -> Optional[ConversationSession]:
+        """Return a live session issued to this owner, or None if it is unknown, expired or someone else's."""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            session = self._sessions.get(session_id)
+            if session is None or session.owner != owner:
+                return None
+            session.last_access = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def _expire(self, now: float):
+        # Sessions are kept in access order, so expired ones sit at the front.
+        while self._sessions:
+            oldest_id, oldest = next(iter(self._sessions.items()))
+            if now - oldest.last_access <= self.ttl_s:
+                break
+            self._sessions.pop(oldest_id)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
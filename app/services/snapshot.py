@@ -0,0 +1,324 @@
+import hashlib
+import json
+import os
+import struct
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from app.core.exceptions import VectorStoreError
+
+try:
+    import zstandard
+except ImportError:  # optional, only needed for compressed snapshots
+    zstandard = None
+
+# File layout:
+#   magic (8 bytes) | header length (uint64 LE) | header JSON | padding | sections...
+# Section offsets in the header are relative to the first 64-byte aligned byte after
+# the header, so uncompressed embeddings can be memory-mapped in place.
+SNAPSHOT_MAGIC = b"RAGSNAP1"
+SNAPSHOT_FORMAT_VERSION = 1
+_ALIGNMENT = 64
+_SEARCH_BLOCK_ROWS = 8192
+_STORAGE_DTYPES = {"float16": "<f2", "float32": "<f4"}
+
+
+@dataclass
+class Snapshot:
+    header: Dict[str, Any]
+    ids: List[str]
+    texts: List[str]
+    metadatas: List[Dict[str, Any]]
+    embeddings: np.ndarray
+    norms: np.ndarray
+
+    @property
+    def index_params(self) -> Dict[str, Any]:
+        return self.header.get("index_params", {})
+
+    @property
+    def memory_mapped(self) -> bool:
+        return isinstance(self.embeddings, np.memmap)
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _compress(data: bytes, compression: Optional[str]) -> bytes:
+    if compression is None:
+        return data
+    if compression != "zstd":
+        raise ValueError(f"Unsupported snapshot compression: {compression}")
+    if zstandard is None:
+        raise VectorStoreError("zstd compression requested but the 'zstandard' package is not installed")
+    return zstandard.ZstdCompressor(level=10).compress(data)
+
+
+def _decompress(data: bytes, compression: Optional[str]) -> bytes:
+    if compression is None:
+        return data
+    if zstandard is None:
+        raise VectorStoreError("Snapshot is zstd-compressed but the 'zstandard' package is not installed")
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def write_snapshot(path: str, collection_name: str, ids: List[str], texts: List[str],
+                   metadatas: List[Dict[str, Any]], embeddings: np.ndarray,
+                   index_params: Optional[Dict[str, Any]] = None, dtype: str = "float32",
+                   compression: Optional[str] = None) -> Dict[str, Any]:
+    """Write a single-file, checksummed snapshot of a collection and return its header."""
+    if dtype not in _STORAGE_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if embeddings.ndim != 2 or embeddings.shape[0] != len(ids):
+        raise ValueError("Embeddings must be a 2-D array with one row per chunk")
+
+    records = json.dumps({"ids": ids, "texts": texts, "metadatas": metadatas},
+                         ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    sections = {
+        "records": _compress(records, compression),
+        "embeddings": _compress(embeddings.astype(_STORAGE_DTYPES[dtype]).tobytes(), compression),
+        "norms": _compress(np.linalg.norm(embeddings, axis=1).astype("<f4").tobytes(), compression),
+    }
+
+    layout = {}
+    offset = 0
+    for name, data in sections.items():
+        offset = _align(offset)
+        layout[name] = {"offset": offset, "length": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+        offset += len(data)
+
+    header = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "collection_name": collection_name,
+        "count": len(ids),
+        "dim": int(embeddings.shape[1]) if embeddings.size else 0,
+        "dtype": dtype,
+        "compression": compression,
+        "index_params": index_params or {},
+        "sections": layout,
+    }
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    data_start = _align(len(SNAPSHOT_MAGIC) + 8 + len(header_bytes))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for name, data in sections.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(data)
+    os.replace(tmp_path, path)
+    return header
+
+
+def _read_header(f) -> Tuple[Dict[str, Any], int]:
+    if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+        raise VectorStoreError("Not a RAG index snapshot (bad magic bytes)")
+    (header_len,) = struct.unpack("<Q", f.read(8))
+    header = json.loads(f.read(header_len).decode("utf-8"))
+    if header.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise VectorStoreError(f"Unsupported snapshot format version: {header.get('format_version')}")
+    return header, _align(len(SNAPSHOT_MAGIC) + 8 + header_len)
+
+
+def read_snapshot(path: str, verify: bool = True, mmap: bool = True) -> Snapshot:
+    """Open a snapshot, memory-mapping the embeddings when they are stored uncompressed."""
+    with open(path, "rb") as f:
+        header, data_start = _read_header(f)
+        compression = header.get("compression")
+
+        def read_section(name: str) -> bytes:
+            section = header["sections"][name]
+            f.seek(data_start + section["offset"])
+            data = f.read(section["length"])
+            if verify and hashlib.sha256(data).hexdigest() != section["sha256"]:
+                raise VectorStoreError(f"Snapshot checksum mismatch in section '{name}'")
+            return data
+
+        records = json.loads(_decompress(read_section("records"), compression))
+        count, dim = header["count"], header["dim"]
+        dtype = np.dtype(_STORAGE_DTYPES[header["dtype"]])
+
+        if mmap and compression is None and count:
+            if verify:
+                read_section("embeddings")
+            embeddings = np.memmap(path, dtype=dtype, mode="r", shape=(count, dim),
+                                   offset=data_start + header["sections"]["embeddings"]["offset"])
+        else:
+            embeddings = np.frombuffer(_decompress(read_section("embeddings"), compression),
+                                       dtype=dtype).reshape(count, dim)
+        norms = np.frombuffer(_decompress(read_section("norms"), compression), dtype="<f4")
+
+    return Snapshot(header=header, ids=records["ids"], texts=records["texts"],
+                    metadatas=records["metadatas"], embeddings=embeddings, norms=norms)
+
+
+class SnapshotVectorStore(VectorStore):
+    """Read-only vector store served from a snapshot with exact NumPy search.
+
+    Implements the subset of the Chroma store used by RAGService (similarity search,
+    retriever and get-by-ID). Distances follow Chroma's conventions for the
+    snapshot's 'hnsw:space' (squared L2, 1 - cosine, or 1 - inner product).
+
+    Metadata filters use Chroma's 'where' syntax ($and, $eq, $ne, $in, $nin, $gt,
+    $gte, $lt, $lte). Per-value row bitmaps are built once per field and combined
+    before the search, so only matching rows are scored.
+    """
+
+    def __init__(self, snapshot: Snapshot, embedding_function: Embeddings):
+        self.snapshot = snapshot
+        self._embedding_function = embedding_function
+        self._space = snapshot.index_params.get("hnsw:space", "l2")
+        self._positions = {chunk_id: i for i, chunk_id in enumerate(snapshot.ids)}
+        self._value_bitmaps: Dict[str, Dict[Any, np.ndarray]] = {}
+        self._numeric_columns: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_file(cls, path: str, embedding_function: Embeddings, verify: bool = True) -> "SnapshotVectorStore":
+        return cls(read_snapshot(path, verify=verify), embedding_function)
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self._embedding_function
+
+    def _document(self, position: int) -> Document:
+        return Document(id=self.snapshot.ids[position], page_content=self.snapshot.texts[position],
+                        metadata=self.snapshot.metadatas[position] or {})
+
+    def _bitmaps(self, field_name: str) -> Dict[Any, np.ndarray]:
+        """Row bitmap per distinct value of a metadata field, built on first use."""
+        if field_name not in self._value_bitmaps:
+            bitmaps: Dict[Any, np.ndarray] = {}
+            for position, metadata in enumerate(self.snapshot.metadatas):
+                value = (metadata or {}).get(field_name)
+                if value not in bitmaps:
+                    bitmaps[value] = np.zeros(len(self.snapshot.ids), dtype=bool)
+                bitmaps[value][position] = True
+            self._value_bitmaps[field_name] = bitmaps
+        return self._value_bitmaps[field_name]
+
+    def _numeric_column(self, field_name: str) -> np.ndarray:
+        """Metadata field as a float column (NaN where missing or non-numeric), built on first use."""
+        if field_name not in self._numeric_columns:
+            values = [(metadata or {}).get(field_name) for metadata in self.snapshot.metadatas]
+            self._numeric_columns[field_name] = np.array(
+                [v if isinstance(v, (int, float)) and not isinstance(v, bool) else np.nan for v in values],
+                dtype=np.float64)
+        return self._numeric_columns[field_name]
+
+    def _where_mask(self, where: Dict[str, Any]) -> np.ndarray:
+        mask = np.ones(len(self.snapshot.ids), dtype=bool)
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._where_mask(clause)
+            elif key == "$or":
+                any_mask = np.zeros(len(self.snapshot.ids), dtype=bool)
+                for clause in condition:
+                    any_mask |= self._where_mask(clause)
+                mask &= any_mask
+            else:
+                mask &= self._condition_mask(key, condition)
+        return mask
+
+    def _condition_mask(self, field_name: str, condition: Any) -> np.ndarray:
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        empty = np.zeros(len(self.snapshot.ids), dtype=bool)
+        mask = ~empty
+        for operator, operand in condition.items():
+            if operator in ("$eq", "$in", "$ne", "$nin"):
+                bitmaps = self._bitmaps(field_name)
+                values = operand if operator in ("$in", "$nin") else [operand]
+                matched = empty.copy()
+                for value in values:
+                    matched |= bitmaps.get(value, empty)
+                mask &= ~matched if operator in ("$ne", "$nin") else matched
+            elif operator in ("$gt", "$gte", "$lt", "$lte"):
+                column = self._numeric_column(field_name)
+                with np.errstate(invalid="ignore"):
+                    mask &= {"$gt": np.greater, "$gte": np.greater_equal,
+                             "$lt": np.less, "$lte": np.less_equal}[operator](column, operand)
+            else:
+                raise VectorStoreError(f"Unsupported filter operator for snapshot store: {operator}")
+        return mask
+
+    def _distances(self, query: np.ndarray, positions: Optional[np.ndarray] = None) -> np.ndarray:
+        matrix = self.snapshot.embeddings
+        norms = self.snapshot.norms
+        rows = matrix.shape[0] if positions is None else positions.shape[0]
+        dots = np.empty(rows, dtype=np.float32)
+        # Blockwise upcast keeps float16 snapshots memory-mapped and BLAS-friendly.
+        for start in range(0, rows, _SEARCH_BLOCK_ROWS):
+            if positions is None:
+                block = matrix[start:start + _SEARCH_BLOCK_ROWS]
+            else:
+                block = matrix[positions[start:start + _SEARCH_BLOCK_ROWS]]
+            dots[start:start + block.shape[0]] = np.asarray(block, dtype=np.float32) @ query
+        if positions is not None:
+            norms = norms[positions]
+        if self._space == "cosine":
+            scaled = norms * (np.linalg.norm(query) or 1.0)
+            return 1.0 - dots / np.where(scaled == 0, 1.0, scaled)
+        if self._space == "ip":
+            return 1.0 - dots
+        return norms ** 2 - 2 * dots + float(query @ query)
+
+    def similarity_search_by_vector_with_score(self, embedding: List[float], k: int = 4,
+                                               filter: Optional[Dict[str, Any]] = None,
+                                               **kwargs: Any) -> List[Tuple[Document, float]]:
+        positions = np.flatnonzero(self._where_mask(filter)) if filter else None
+        candidates = len(self.snapshot.ids) if positions is None else positions.shape[0]
+        if not candidates:
+            return []
+        distances = self._distances(np.asarray(embedding, dtype=np.float32), positions)
+        k = min(k, candidates)
+        top = np.argpartition(distances, k - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        rows = top if positions is None else positions[top]
+        return [(self._document(int(row)), float(distances[i])) for row, i in zip(rows, top)]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k, **kwargs)]
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self._embedding_function.embed_query(query), k, **kwargs)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
+
+    def _select_relevance_score_fn(self):
+        if self._space == "cosine":
+            return self._cosine_relevance_score_fn
+        if self._space == "ip":
+            return self._max_inner_product_relevance_score_fn
+        return self._euclidean_relevance_score_fn
+
+    def get(self, ids: Optional[List[str]] = None, include: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Chroma-compatible get-by-ID."""
+        include = include or ["documents", "metadatas"]
+        positions = ([self._positions[i] for i in ids if i in self._positions]
+                     if ids is not None else list(range(len(self.snapshot.ids))))
+        result: Dict[str, Any] = {"ids": [self.snapshot.ids[p] for p in positions]}
+        if "documents" in include:
+            result["documents"] = [self.snapshot.texts[p] for p in positions]
+        if "metadatas" in include:
+            result["metadatas"] = [self.snapshot.metadatas[p] for p in positions]
+        if "embeddings" in include:
+            result["embeddings"] = [np.asarray(self.snapshot.embeddings[p], dtype=np.float32) for p in positions]
+        return result
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None, **kwargs: Any) -> List[str]:
+        raise VectorStoreError("Snapshot vector store is read-only; re-export the snapshot instead")
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings, metadatas: Optional[List[dict]] = None,
+                   **kwargs: Any) -> "SnapshotVectorStore":
+        raise VectorStoreError("Snapshot vector store is read-only; build snapshots with "
+                               "'scripts/snapshot_index.py export'")
@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from app.core.logging_config import logger
+
+try:
+    import tiktoken
+    _TOKENIZER = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken missing or encoding files unavailable
+    _TOKENIZER = None
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, falling back to a 4-chars-per-token estimate."""
+    if _TOKENIZER is not None:
+        return len(_TOKENIZER.encode(text))
+    return max(len(text) // 4, 1) if text else 0
+
+
+@dataclass
+class UsageRecord:
+    llm_provider: str
+    client_id: Optional[str]
+    embedding_tokens: int
+    prompt_tokens: int
+    completion_tokens: int
+    usage_source: str  # "provider" or "estimate"
+    estimated_cost_usd: float
+    processing_time_ms: float
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.embedding_tokens + self.prompt_tokens + self.completion_tokens
+
+
+class UsageTracker:
+    """Per-provider token counters, per-client budgets and a periodic JSONL export."""
+
+    def __init__(self, export_path: str = "", export_interval_s: float = 30.0,
+                 client_budget: int = 0, client_window_s: float = 3600.0):
+        self.export_path = export_path
+        self.export_interval_s = export_interval_s
+        self.client_budget = client_budget
+        self.client_window_s = client_window_s
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        # (timestamp, client_id, tokens) in arrival order, and the per-client sums over it
+        self._client_events: Deque[Tuple[float, str, int]] = deque()
+        self._client_tokens: Dict[str, int] = {}
+        self._pending: List[UsageRecord] = []
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if export_path:
+            self._flusher = threading.Thread(target=self._flush_loop, name="usage-export", daemon=True)
+            self._flusher.start()
+
+    def client_tokens_used(self, client_id: str) -> int:
+        """Tokens used by a client within the current budget window."""
+        with self._lock:
+            self._expire_client_usage(time.time() - self.client_window_s)
+            return self._client_tokens.get(client_id, 0)
+
+    def _expire_client_usage(self, cutoff: float):
+        # Caller holds the lock. Clients with nothing left in the window are dropped,
+        # so one-off client IDs do not accumulate.
+        while self._client_events and self._client_events[0][0] < cutoff:
+            _, client_id, tokens = self._client_events.popleft()
+            remaining = self._client_tokens.get(client_id, 0) - tokens
+            if remaining > 0:
+                self._client_tokens[client_id] = remaining
+            else:
+                self._client_tokens.pop(client_id, None)
+
+    def remaining_client_budget(self, client_id: str) -> Optional[int]:
+        """Remaining tokens for a client, or None when no per-client budget is configured."""
+        if not self.client_budget:
+            return None
+        return self.client_budget - self.client_tokens_used(client_id)
+
+    def record(self, record: UsageRecord):
+        with self._lock:
+            totals = self._totals[record.llm_provider]
+            totals["requests"] += 1
+            totals["embedding_tokens"] += record.embedding_tokens
+            totals["prompt_tokens"] += record.prompt_tokens
+            totals["completion_tokens"] += record.completion_tokens
+            totals["total_tokens"] += record.total_tokens
+            totals["estimated_cost_usd"] += record.estimated_cost_usd
+            totals["processing_time_ms"] += record.processing_time_ms
+            if record.client_id and self.client_budget:
+                self._client_events.append((record.timestamp, record.client_id, record.total_tokens))
+                self._client_tokens[record.client_id] = (self._client_tokens.get(record.client_id, 0)
+                                                         + record.total_tokens)
+                self._expire_client_usage(time.time() - self.client_window_s)
+            if self.export_path:
+                self._pending.append(record)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Aggregated counters per provider."""
+        with self._lock:
+            return {provider: dict(totals) for provider, totals in self._totals.items()}
+
+    def flush(self):
+        """Append buffered usage records to the JSONL export file."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.export_path)), exist_ok=True)
+            with open(self.export_path, "a", encoding="utf-8") as f:
+                for record in pending:
+                    f.write(json.dumps({**asdict(record), "total_tokens": record.total_tokens}) + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to export {len(pending)} usage records to {self.export_path}: {e}")
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.export_interval_s):
+            self.flush()
+
+    def shutdown(self):
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=self.export_interval_s)
+        if self.export_path:
+            self.flush()
+
+
+def estimate_cost(pricing: Dict[str, float], embedding_tokens: int, prompt_tokens: int,
+                  completion_tokens: int) -> float:
+    """Estimated request cost in USD from per-1K-token prices."""
+    return round((embedding_tokens * pricing.get("embedding", 0.0)
+                  + prompt_tokens * pricing.get("prompt", 0.0)
+                  + completion_tokens * pricing.get("completion", 0.0)) / 1000, 6)
+
+
+def provider_usage(usage_metadata: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """Sum (input, output) tokens reported by the provider across models, if any were reported."""
+    if not usage_metadata:
+        return None
+    prompt_tokens = sum(usage.get("input_tokens", 0) for usage in usage_metadata.values())
+    completion_tokens = sum(usage.get("output_tokens", 0) for usage in usage_metadata.values())
+    return prompt_tokens, completion_tokens
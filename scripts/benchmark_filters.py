@@ -0,0 +1,114 @@
+"""Benchmark latensi pencarian dengan filter metadata terhadap ukuran korpus.
+
+Membuat korpus sintetis (embedding acak dengan metadata source/page/document_type
+seperti hasil scripts/ingest_data.py) untuk beberapa ukuran, lalu mengukur p50/p99
+latensi pencarian tanpa filter, dengan filter source, dan dengan filter source +
+rentang halaman. Filter dijalankan di dalam pencarian (where clause Chroma atau
+bitmap pada SnapshotVectorStore), bukan setelah retrieval.
+
+Contoh:
+    python scripts/benchmark_filters.py --sizes 1000 10000 50000 --backend snapshot chroma
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT_DIR)
+
+from app.services.snapshot import Snapshot, SnapshotVectorStore  # noqa: E402
+
+PAGES_PER_SOURCE = 200
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark pencarian dengan filter metadata.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000, 50000])
+    parser.add_argument("--dim", type=int, default=1536, help="Dimensi embedding (text-embedding-3-small = 1536)")
+    parser.add_argument("--sources", type=int, default=20, help="Jumlah file sumber sintetis")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--space", choices=["cosine", "l2", "ip"], default="l2")
+    parser.add_argument("--backend", nargs="+", choices=["snapshot", "chroma"], default=["snapshot"])
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def make_corpus(size, dim, num_sources, rng):
+    embeddings = rng.standard_normal((size, dim), dtype=np.float32)
+    metadatas = [{"source": f"guideline_{i % num_sources:03d}.pdf",
+                  "page": (i // num_sources) % PAGES_PER_SOURCE,
+                  "document_type": "guideline"} for i in range(size)]
+    ids = [f"chunk-{i}" for i in range(size)]
+    return ids, embeddings, metadatas
+
+
+def filter_cases():
+    one_source = {"source": {"$in": ["guideline_001.pdf"]}}
+    return {
+        "none": None,
+        "source": one_source,
+        "source+pages": {"$and": [one_source, {"page": {"$gte": 10}}, {"page": {"$lte": 30}}]},
+    }
+
+
+def build_snapshot_search(ids, embeddings, metadatas, space):
+    snapshot = Snapshot(header={"index_params": {"hnsw:space": space}}, ids=ids,
+                        texts=[""] * len(ids), metadatas=metadatas, embeddings=embeddings,
+                        norms=np.linalg.norm(embeddings, axis=1))
+    store = SnapshotVectorStore(snapshot, embedding_function=None)
+
+    def search(query, k, where):
+        return store.similarity_search_by_vector(query, k=k, filter=where)
+    return search
+
+
+def build_chroma_search(ids, embeddings, metadatas, space):
+    import chromadb
+
+    client = chromadb.EphemeralClient()
+    name = f"bench_{len(ids)}"
+    if name in [c if isinstance(c, str) else c.name for c in client.list_collections()]:
+        client.delete_collection(name)
+    collection = client.create_collection(name, metadata={"hnsw:space": space})
+    batch_size = client.get_max_batch_size()
+    for i in range(0, len(ids), batch_size):
+        collection.add(ids=ids[i:i + batch_size], embeddings=embeddings[i:i + batch_size],
+                       metadatas=metadatas[i:i + batch_size])
+
+    def search(query, k, where):
+        return collection.query(query_embeddings=[query], n_results=k, where=where)
+    return search
+
+
+def measure(search, queries, k, where):
+    latencies_ms = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query, k, where)
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+    return np.percentile(latencies_ms, 50), np.percentile(latencies_ms, 99)
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    builders = {"snapshot": build_snapshot_search, "chroma": build_chroma_search}
+
+    print(f"{'backend':>8} {'size':>8} {'filter':>13} {'p50_ms':>9} {'p99_ms':>9}")
+    for size in args.sizes:
+        ids, embeddings, metadatas = make_corpus(size, args.dim, args.sources, rng)
+        queries = [q.tolist() for q in rng.standard_normal((args.queries, args.dim), dtype=np.float32)]
+        for backend in args.backend:
+            search = builders[backend](ids, embeddings, metadatas, args.space)
+            for case, where in filter_cases().items():
+                search(queries[0], args.k, where)  # warm-up (builds bitmaps / loads index)
+                p50, p99 = measure(search, queries, args.k, where)
+                print(f"{backend:>8} {size:>8} {case:>13} {p50:>9.3f} {p99:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
+import argparse
+import hashlib
+import json
 import os
 import shutil
+import statistics
+import time
 from dotenv import load_dotenv
 
 from langchain_community.document_loaders import PyPDFLoader
@@ -27,9 +32,24 @@ DATA_DIR = os.path.join(PROJECT_ROOT_DIR, "data")
 VECTOR_STORE_DIR = os.path.join(PROJECT_ROOT_DIR, "vector_store", "chroma_db_azure_multi")
 COLLECTION_NAME = "rag_azure_multi_pdf_collection"
 
+# Pemetaan opsional nama file PDF -> jenis dokumen untuk filter document_types saat query,
+# mis. {"panduan_epilepsi.pdf": "guideline", "jurnal_2023.pdf": "journal"}
+DOCUMENT_TYPES_FILE = os.path.join(DATA_DIR, "document_types.json")
+UNCLASSIFIED_DOCUMENT_TYPE = "unclassified"
+
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
 
+# Cache teks halaman hasil parsing PDF (JSONL per file, dikunci dengan hash SHA-256 file)
+PAGE_CACHE_DIR = os.path.join(PROJECT_ROOT_DIR, "vector_store", "page_cache")
+PAGE_CACHE_INDEX = os.path.join(PAGE_CACHE_DIR, "index.json")
+
+# Parameter HNSW untuk koleksi baru (lihat scripts/tune_hnsw.py); kosong = default Chroma
+HNSW_SPACE = os.getenv("HNSW_SPACE", "l2")
+HNSW_M = os.getenv("HNSW_M")
+HNSW_CONSTRUCTION_EF = os.getenv("HNSW_CONSTRUCTION_EF")
+HNSW_SEARCH_EF = os.getenv("HNSW_SEARCH_EF")
+
 # Opsi untuk membersihkan vector store lama sebelum ingest
 CLEAN_VECTOR_STORE_BEFORE_INGEST = True  # Set True untuk selalu memulai dari bersih
 
@@ -47,48 +67,188 @@ def validate_config():
     return True
 
 
-def load_and_split_pdfs():
-    """Memuat semua PDF dari DATA_DIR, memecahnya menjadi chunks."""
-    all_chunks = []
-    pdf_file_names = [f for f in os.listdir(DATA_DIR) if f.lower().endswith(".pdf")]
+def file_sha256(file_path):
+    """Menghitung hash SHA-256 dari isi file."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_cache_index():
+    if os.path.exists(PAGE_CACHE_INDEX):
+        with open(PAGE_CACHE_INDEX, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def _save_cache_index(index):
+    os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+    tmp_path = PAGE_CACHE_INDEX + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, PAGE_CACHE_INDEX)
+
+
+def _cached_file_hash(pdf_file_path, pdf_file_name, index):
+    """Mengambil hash file dari index jika ukuran dan mtime tidak berubah, jika tidak hitung ulang."""
+    stat = os.stat(pdf_file_path)
+    entry = index.get(pdf_file_name)
+    if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+        return entry["sha256"]
+    file_hash = file_sha256(pdf_file_path)
+    index[pdf_file_name] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": file_hash}
+    return file_hash
+
+
+def load_document_types():
+    """Membaca pemetaan nama file -> jenis dokumen dari DOCUMENT_TYPES_FILE, jika ada."""
+    if not os.path.exists(DOCUMENT_TYPES_FILE):
+        return {}
+    with open(DOCUMENT_TYPES_FILE, "r", encoding="utf-8") as f:
+        document_types = json.load(f)
+    if not isinstance(document_types, dict) or not all(
+            isinstance(k, str) and isinstance(v, str) and v.strip() for k, v in document_types.items()):
+        raise ValueError(f"{DOCUMENT_TYPES_FILE} harus berupa objek JSON {{\"nama_file.pdf\": \"jenis\"}}")
+    return {name: doc_type.strip() for name, doc_type in document_types.items()}
+
+
+def load_pdf_pages(pdf_file_name, index, document_types, refresh=False):
+    """Memuat halaman PDF dari cache JSONL, atau mem-parsing PDF sekali lalu menyimpannya ke cache."""
+    pdf_file_path = os.path.join(DATA_DIR, pdf_file_name)
+    # Diambil dari pemetaan, bukan dari cache, agar perubahan jenis tidak perlu parsing ulang
+    document_type = document_types.get(pdf_file_name, UNCLASSIFIED_DOCUMENT_TYPE)
+    file_hash = _cached_file_hash(pdf_file_path, pdf_file_name, index)
+    cache_path = os.path.join(PAGE_CACHE_DIR, f"{file_hash}.jsonl")
+
+    if not refresh and os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            pages = [json.loads(line) for line in f]
+        # Nama file bisa berubah walaupun isinya sama
+        return [Document(page_content=p["page_content"],
+                         metadata={**p["metadata"], "source": pdf_file_name,
+                                   "document_type": document_type})
+                for p in pages], True
+
+    loader = PyPDFLoader(pdf_file_path)
+    documents_from_pdf = loader.load()
+
+    for doc in documents_from_pdf:
+        # Pastikan metadata source ada dan benar
+        doc.metadata["source"] = pdf_file_name
+        # Dipakai untuk filter jenis dokumen saat query
+        doc.metadata["document_type"] = document_type
+        # Jika PyPDFLoader tidak mengisi 'page', Anda mungkin perlu cara lain atau mengabaikannya
+        if 'page' not in doc.metadata:
+            doc.metadata['page'] = 'N/A'  # Default jika tidak ada
+
+    os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for doc in documents_from_pdf:
+            f.write(json.dumps({"page_content": doc.page_content, "metadata": doc.metadata},
+                               ensure_ascii=False, default=str))
+            f.write("\n")
+    os.replace(tmp_path, cache_path)
+    return documents_from_pdf, False
+
+
+def load_all_pages(refresh=False):
+    """Memuat halaman semua PDF di DATA_DIR, memakai cache halaman jika tersedia."""
+    pdf_file_names = sorted(f for f in os.listdir(DATA_DIR) if f.lower().endswith(".pdf"))
 
     if not pdf_file_names:
         print(f"Tidak ada file PDF yang ditemukan di {DATA_DIR}")
-        return []
+        return {}
 
     print(f"Ditemukan {len(pdf_file_names)} file PDF di {DATA_DIR}.")
 
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=CHUNK_SIZE,
-        chunk_overlap=CHUNK_OVERLAP,
-        length_function=len,
-        is_separator_regex=False,
-    )
+    document_types = load_document_types()
+    unclassified = [name for name in pdf_file_names if name not in document_types]
+    if unclassified:
+        print(f"{len(unclassified)} file tidak ada di {DOCUMENT_TYPES_FILE} dan diberi jenis "
+              f"'{UNCLASSIFIED_DOCUMENT_TYPE}': {', '.join(unclassified)}")
 
+    index = _load_cache_index()
+    pages_by_file = {}
     for pdf_file_name in pdf_file_names:
-        pdf_file_path = os.path.join(DATA_DIR, pdf_file_name)
         try:
-            print(f"Memproses: {pdf_file_name}...")
-            loader = PyPDFLoader(pdf_file_path)
-            documents_from_pdf = loader.load()
-
-            for doc in documents_from_pdf:
-                # Pastikan metadata source ada dan benar
-                doc.metadata["source"] = pdf_file_name
-                # Jika PyPDFLoader tidak mengisi 'page', Anda mungkin perlu cara lain atau mengabaikannya
-                if 'page' not in doc.metadata:
-                    doc.metadata['page'] = 'N/A'  # Default jika tidak ada
-
-            chunks_from_doc_content = text_splitter.split_documents(documents_from_pdf)
-            all_chunks.extend(chunks_from_doc_content)
-            print(f" -> {len(documents_from_pdf)} halaman dimuat, {len(chunks_from_doc_content)} chunks dibuat.")
+            start = time.perf_counter()
+            pages, from_cache = load_pdf_pages(pdf_file_name, index, document_types, refresh=refresh)
+            pages_by_file[pdf_file_name] = pages
+            origin = "cache" if from_cache else "parsing PDF"
+            print(f"Memproses: {pdf_file_name} -> {len(pages)} halaman dari {origin} "
+                  f"({(time.perf_counter() - start) * 1000:.1f}ms)")
         except Exception as e:
             print(f"Error saat memproses {pdf_file_name}: {e}")
+    _save_cache_index(index)
+    return pages_by_file
+
+
+def split_pages(pages_by_file, chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP, verbose=True):
+    """Memecah halaman yang sudah dimuat menjadi chunks."""
+    text_splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        is_separator_regex=False,
+    )
 
+    all_chunks = []
+    for pdf_file_name, pages in pages_by_file.items():
+        chunks_from_doc_content = text_splitter.split_documents(pages)
+        all_chunks.extend(chunks_from_doc_content)
+        if verbose:
+            print(f" -> {pdf_file_name}: {len(pages)} halaman, {len(chunks_from_doc_content)} chunks dibuat.")
+    return all_chunks
+
+
+def load_and_split_pdfs(refresh_cache=False):
+    """Memuat semua PDF dari DATA_DIR (lewat cache halaman), memecahnya menjadi chunks."""
+    pages_by_file = load_all_pages(refresh=refresh_cache)
+    if not pages_by_file:
+        return []
+
+    all_chunks = split_pages(pages_by_file)
     print(f"\nTotal chunks yang dihasilkan dari semua PDF: {len(all_chunks)}")
     return all_chunks
 
 
+def compare_chunking_configs(configs):
+    """Membandingkan beberapa konfigurasi (chunk_size, chunk_overlap) memakai halaman dari cache."""
+    pages_by_file = load_all_pages()
+    if not pages_by_file:
+        return
+
+    tokenizer = tiktoken.get_encoding("cl100k_base")
+    print(f"\n{'size':>6} {'overlap':>8} {'chunks':>8} {'avg_chars':>10} {'p95_chars':>10} "
+          f"{'avg_tok':>8} {'total_tok':>10} {'split_ms':>9}")
+    for chunk_size, chunk_overlap in configs:
+        start = time.perf_counter()
+        chunks = split_pages(pages_by_file, chunk_size, chunk_overlap, verbose=False)
+        split_ms = (time.perf_counter() - start) * 1000
+        if not chunks:
+            print(f"{chunk_size:>6} {chunk_overlap:>8} {0:>8}")
+            continue
+        lengths = sorted(len(c.page_content) for c in chunks)
+        tokens = [len(tokenizer.encode(c.page_content)) for c in chunks]
+        p95 = lengths[min(int(len(lengths) * 0.95), len(lengths) - 1)]
+        print(f"{chunk_size:>6} {chunk_overlap:>8} {len(chunks):>8} {statistics.mean(lengths):>10.1f} {p95:>10} "
+              f"{statistics.mean(tokens):>8.1f} {sum(tokens):>10} {split_ms:>9.1f}")
+
+
+def parse_chunk_config(value):
+    """Parsing argumen 'SIZE:OVERLAP' menjadi tuple (size, overlap)."""
+    try:
+        size, overlap = (int(part) for part in value.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Format harus SIZE:OVERLAP, bukan '{value}'")
+    if overlap >= size:
+        raise argparse.ArgumentTypeError(f"Overlap harus lebih kecil dari size: '{value}'")
+    return size, overlap
+
+
 def calculate_estimated_tokens(chunks):
     """Menghitung estimasi total token untuk semua chunks."""
     if not chunks:
@@ -106,6 +266,18 @@ def calculate_estimated_tokens(chunks):
         return -1  # Indikasi error
 
 
+def build_hnsw_metadata():
+    """Menyusun metadata koleksi Chroma dari parameter HNSW yang dikonfigurasi."""
+    metadata = {"hnsw:space": HNSW_SPACE}
+    if HNSW_M:
+        metadata["hnsw:M"] = int(HNSW_M)
+    if HNSW_CONSTRUCTION_EF:
+        metadata["hnsw:construction_ef"] = int(HNSW_CONSTRUCTION_EF)
+    if HNSW_SEARCH_EF:
+        metadata["hnsw:search_ef"] = int(HNSW_SEARCH_EF)
+    return metadata
+
+
 def ingest_to_chromadb(chunks, embeddings_model):
     """Mengindeks chunks ke ChromaDB."""
     if not chunks:
@@ -122,13 +294,16 @@ def ingest_to_chromadb(chunks, embeddings_model):
 
     os.makedirs(VECTOR_STORE_DIR, exist_ok=True)
 
+    hnsw_metadata = build_hnsw_metadata()
     print(f"Membuat atau menimpa vector store di: {VECTOR_STORE_DIR} dengan koleksi: {COLLECTION_NAME}")
+    print(f"Parameter HNSW: {hnsw_metadata}")
     try:
         vector_store = Chroma.from_documents(
             documents=chunks,
             embedding=embeddings_model,
             collection_name=COLLECTION_NAME,
-            persist_directory=VECTOR_STORE_DIR
+            persist_directory=VECTOR_STORE_DIR,
+            collection_metadata=hnsw_metadata
         )
         vector_store.persist()
         print("Data berhasil diindeks dan disimpan ke ChromaDB.")
@@ -137,12 +312,26 @@ def ingest_to_chromadb(chunks, embeddings_model):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Ingest PDF di data/ ke ChromaDB.")
+    parser.add_argument("--compare-chunking", nargs="+", type=parse_chunk_config, metavar="SIZE:OVERLAP",
+                        help="Bandingkan konfigurasi chunking dari cache halaman tanpa ingest, mis. 1000:200 500:100")
+    parser.add_argument("--refresh-page-cache", action="store_true",
+                        help="Parsing ulang semua PDF dan timpa cache halaman")
+    args = parser.parse_args()
+
+    if args.compare_chunking:
+        if not os.path.isdir(DATA_DIR):
+            print(f"ERROR: Direktori data tidak ditemukan: {DATA_DIR}")
+            return
+        compare_chunking_configs(args.compare_chunking)
+        return
+
     print("Memulai proses ingest data...")
     if not validate_config():
         return
 
-    # 1. Muat dan pecah PDF menjadi chunks
-    all_pdf_chunks = load_and_split_pdfs()
+    # 1. Muat (dari cache halaman jika ada) dan pecah PDF menjadi chunks
+    all_pdf_chunks = load_and_split_pdfs(refresh_cache=args.refresh_page_cache)
     if not all_pdf_chunks:
         print("Proses ingest dihentikan karena tidak ada chunks yang dihasilkan.")
         return
@@ -0,0 +1,155 @@
+"""Export/import koleksi ChromaDB sebagai snapshot satu file, dan ukur waktu siap-pakai.
+
+Snapshot berisi chunk ID, teks, metadata, embedding (float16/float32) dan parameter
+index HNSW, dengan checksum SHA-256 per bagian dan kompresi zstd opsional. API dapat
+langsung boot dari snapshot dengan mengisi VECTOR_STORE_SNAPSHOT_PATH di .env.
+
+Contoh:
+    python scripts/snapshot_index.py export vector_store/index.ragsnap --dtype float16
+    python scripts/snapshot_index.py import vector_store/index.ragsnap
+    python scripts/snapshot_index.py bench vector_store/index.ragsnap
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import chromadb
+import numpy as np
+
+PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT_DIR)
+
+from app.services.snapshot import SnapshotVectorStore, read_snapshot, write_snapshot  # noqa: E402
+
+VECTOR_STORE_DIR = os.path.join(PROJECT_ROOT_DIR, "vector_store", "chroma_db_azure_multi")
+COLLECTION_NAME = "rag_azure_multi_pdf_collection"
+EXPORT_PAGE_SIZE = 5000
+
+
+def export_snapshot(args):
+    """Membaca seluruh koleksi Chroma dan menulisnya sebagai snapshot."""
+    start = time.perf_counter()
+    client = chromadb.PersistentClient(path=args.persist_dir)
+    collection = client.get_collection(args.collection)
+
+    ids, texts, metadatas, embeddings = [], [], [], []
+    offset = 0
+    while True:
+        page = collection.get(include=["embeddings", "documents", "metadatas"],
+                              limit=EXPORT_PAGE_SIZE, offset=offset)
+        if not page["ids"]:
+            break
+        ids.extend(page["ids"])
+        texts.extend(page["documents"])
+        metadatas.extend(page["metadatas"])
+        embeddings.append(np.asarray(page["embeddings"], dtype=np.float32))
+        offset += len(page["ids"])
+
+    if not ids:
+        print(f"Koleksi '{args.collection}' kosong, tidak ada yang diekspor.")
+        return
+    index_params = {k: v for k, v in (collection.metadata or {}).items() if k.startswith("hnsw:")}
+    header = write_snapshot(args.snapshot, args.collection, ids, texts, metadatas, np.vstack(embeddings),
+                            index_params=index_params, dtype=args.dtype,
+                            compression=None if args.compression == "none" else args.compression)
+    size_mb = os.path.getsize(args.snapshot) / (1024 * 1024)
+    print(f"{header['count']} chunks (dim={header['dim']}, {header['dtype']}, kompresi={args.compression}) "
+          f"diekspor ke {args.snapshot} ({size_mb:.2f}MB) dalam {time.perf_counter() - start:.2f}s")
+
+
+def import_snapshot(args):
+    """Membangun ulang direktori Chroma dari snapshot (untuk node yang tetap memakai Chroma)."""
+    start = time.perf_counter()
+    snapshot = read_snapshot(args.snapshot, mmap=False)
+    if os.path.exists(args.persist_dir):
+        if not args.overwrite:
+            print(f"ERROR: {args.persist_dir} sudah ada. Gunakan --overwrite untuk menimpanya.")
+            return
+        shutil.rmtree(args.persist_dir)
+
+    client = chromadb.PersistentClient(path=args.persist_dir)
+    collection = client.create_collection(snapshot.header["collection_name"],
+                                          metadata=snapshot.index_params or None)
+    batch_size = client.get_max_batch_size()
+    for i in range(0, len(snapshot.ids), batch_size):
+        collection.add(ids=snapshot.ids[i:i + batch_size],
+                       documents=snapshot.texts[i:i + batch_size],
+                       metadatas=snapshot.metadatas[i:i + batch_size],
+                       embeddings=np.asarray(snapshot.embeddings[i:i + batch_size], dtype=np.float32))
+    print(f"{len(snapshot.ids)} chunks diimpor ke {args.persist_dir} dalam {time.perf_counter() - start:.2f}s")
+
+
+def bench(args):
+    """Membandingkan waktu siap-pakai: salin direktori Chroma vs salin snapshot, buka, query pertama.
+
+    Snapshot diukur dengan dan tanpa verifikasi checksum (VECTOR_STORE_SNAPSHOT_VERIFY),
+    karena verifikasi membaca dan meng-hash seluruh bagian embedding saat boot.
+    """
+    snapshot = read_snapshot(args.snapshot, mmap=False)
+    query = np.asarray(snapshot.embeddings[0], dtype=np.float32).tolist()
+    timings = {"chroma": [], "snapshot (verify)": [], "snapshot (no verify)": []}
+
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            start = time.perf_counter()
+            chroma_copy = os.path.join(tmp_dir, "chroma")
+            shutil.copytree(args.persist_dir, chroma_copy)
+            copied = time.perf_counter()
+            collection = chromadb.PersistentClient(path=chroma_copy).get_collection(args.collection)
+            collection.query(query_embeddings=[query], n_results=args.k)
+            timings["chroma"].append((copied - start, time.perf_counter() - copied))
+
+            for label, verify in (("snapshot (verify)", True), ("snapshot (no verify)", False)):
+                start = time.perf_counter()
+                snapshot_copy = os.path.join(tmp_dir, f"{int(verify)}_{os.path.basename(args.snapshot)}")
+                shutil.copyfile(args.snapshot, snapshot_copy)
+                copied = time.perf_counter()
+                store = SnapshotVectorStore.from_file(snapshot_copy, embedding_function=None, verify=verify)
+                store.similarity_search_by_vector(query, k=args.k)
+                timings[label].append((copied - start, time.perf_counter() - copied))
+
+    print(f"Median dari {args.runs} run (copy = salin ke node baru, open+query = buka dan query pertama):")
+    print(f"{'':>22} {'copy_ms':>9} {'open+query_ms':>14} {'total_ms':>9}")
+    for label, runs in timings.items():
+        copy_ms = float(np.median([c for c, _ in runs])) * 1000
+        ready_ms = float(np.median([r for _, r in runs])) * 1000
+        print(f"{label:>22} {copy_ms:>9.1f} {ready_ms:>14.1f} {copy_ms + ready_ms:>9.1f}")
+
+    chroma_mb = sum(os.path.getsize(os.path.join(root, name))
+                    for root, _, files in os.walk(args.persist_dir) for name in files) / (1024 * 1024)
+    print(f"Ukuran: direktori Chroma {chroma_mb:.2f}MB, snapshot {os.path.getsize(args.snapshot) / (1024 * 1024):.2f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot satu file untuk index vector store.")
+    parser.add_argument("--persist-dir", default=VECTOR_STORE_DIR)
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Ekspor koleksi Chroma ke snapshot")
+    export_parser.add_argument("snapshot")
+    export_parser.add_argument("--dtype", choices=["float16", "float32"], default="float32")
+    export_parser.add_argument("--compression", choices=["none", "zstd"], default="none",
+                               help="zstd memperkecil file, tetapi embedding tidak bisa di-memory-map")
+    export_parser.set_defaults(func=export_snapshot)
+
+    import_parser = subparsers.add_parser("import", help="Bangun direktori Chroma dari snapshot")
+    import_parser.add_argument("snapshot")
+    import_parser.add_argument("--overwrite", action="store_true")
+    import_parser.set_defaults(func=import_snapshot)
+
+    bench_parser = subparsers.add_parser("bench", help="Ukur waktu siap-pakai Chroma vs snapshot")
+    bench_parser.add_argument("snapshot")
+    bench_parser.add_argument("--runs", type=int, default=3)
+    bench_parser.add_argument("--k", type=int, default=4)
+    bench_parser.set_defaults(func=bench)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Sweep parameter HNSW pada embedding koleksi ChromaDB yang sudah ada.
+
+Membandingkan recall@k, latensi pencarian (p50/p99), waktu build dan ukuran index
+untuk setiap kombinasi (space, M, construction_ef, search_ef) terhadap ground truth
+brute-force NumPy. Pilih kombinasi terbaik lalu set HNSW_* di .env dan jalankan
+ulang scripts/ingest_data.py.
+
+Contoh:
+    python scripts/tune_hnsw.py --m 8 16 32 --construction-ef 100 200 --search-ef 10 50 100
+"""
+import argparse
+import itertools
+import json
+import os
+import tempfile
+import time
+
+import chromadb
+import hnswlib
+import numpy as np
+
+PROJECT_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VECTOR_STORE_DIR = os.path.join(PROJECT_ROOT_DIR, "vector_store", "chroma_db_azure_multi")
+COLLECTION_NAME = "rag_azure_multi_pdf_collection"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Sweep parameter HNSW untuk koleksi ChromaDB.")
+    parser.add_argument("--persist-dir", default=VECTOR_STORE_DIR)
+    parser.add_argument("--collection", default=COLLECTION_NAME)
+    parser.add_argument("--space", nargs="+", default=["cosine", "l2"], choices=["cosine", "l2", "ip"])
+    parser.add_argument("--m", nargs="+", type=int, default=[8, 16, 32])
+    parser.add_argument("--construction-ef", nargs="+", type=int, default=[100, 200])
+    parser.add_argument("--search-ef", nargs="+", type=int, default=[10, 50, 100])
+    parser.add_argument("--k", type=int, default=4, help="k untuk recall@k (samakan dengan RETRIEVER_SEARCH_K)")
+    parser.add_argument("--queries", type=int, default=200,
+                        help="Jumlah embedding sampel yang dikeluarkan dari index dan dipakai sebagai query")
+    parser.add_argument("--query-embeddings",
+                        help="File .npy berisi embedding pertanyaan asli (N x dim); jika diisi, dipakai "
+                             "sebagai query dan seluruh koleksi masuk ke index")
+    parser.add_argument("--threads", type=int, default=1, help="Thread untuk build index")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON ke path ini")
+    return parser.parse_args()
+
+
+def load_embeddings(persist_dir, collection_name):
+    """Membaca semua embedding dari koleksi ChromaDB."""
+    client = chromadb.PersistentClient(path=persist_dir)
+    collection = client.get_collection(collection_name)
+    result = collection.get(include=["embeddings"])
+    embeddings = np.asarray(result["embeddings"], dtype=np.float32)
+    print(f"{len(embeddings)} embedding (dim={embeddings.shape[1]}) dimuat dari koleksi '{collection_name}'.")
+    return embeddings, collection.metadata or {}
+
+
+def exact_neighbours(data, queries, k, space):
+    """Ground truth brute-force dengan NumPy, memakai definisi jarak yang sama dengan hnswlib."""
+    if space == "cosine":
+        data = data / np.linalg.norm(data, axis=1, keepdims=True)
+        queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    if space == "l2":
+        distances = (np.sum(queries ** 2, axis=1)[:, None] - 2 * queries @ data.T
+                     + np.sum(data ** 2, axis=1)[None, :])
+    else:
+        distances = 1.0 - queries @ data.T
+    top = np.argpartition(distances, kth=min(k, data.shape[0] - 1), axis=1)[:, :k]
+    order = np.take_along_axis(distances, top, axis=1).argsort(axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def build_index(data, space, m, construction_ef, threads):
+    index = hnswlib.Index(space=space, dim=data.shape[1])
+    start = time.perf_counter()
+    index.init_index(max_elements=data.shape[0], ef_construction=construction_ef, M=m)
+    index.add_items(data, np.arange(data.shape[0]), num_threads=threads)
+    build_s = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index_path = os.path.join(tmp_dir, "index.bin")
+        index.save_index(index_path)
+        index_mb = os.path.getsize(index_path) / (1024 * 1024)
+    return index, build_s, index_mb
+
+
+def evaluate(index, queries, truth, k, search_ef):
+    """Menjalankan query satu per satu (seperti di RAGService) dan menghitung recall serta latensi."""
+    index.set_ef(max(search_ef, k))
+    latencies_ms = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        labels, _ = index.knn_query(query, k=k)
+        latencies_ms.append((time.perf_counter() - start) * 1000)
+        hits += len(set(labels[0].tolist()) & set(expected.tolist()))
+    return {
+        "recall_at_k": hits / (len(queries) * k),
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+    }
+
+
+def main():
+    args = parse_args()
+    data, current_metadata = load_embeddings(args.persist_dir, args.collection)
+    print(f"Metadata HNSW koleksi saat ini: {current_metadata or 'default'}")
+
+    if args.query_embeddings:
+        queries = np.asarray(np.load(args.query_embeddings), dtype=np.float32)
+        if queries.ndim != 2 or queries.shape[1] != data.shape[1]:
+            print(f"ERROR: {args.query_embeddings} harus berdimensi (N, {data.shape[1]}).")
+            return
+        print(f"{len(queries)} embedding pertanyaan dimuat dari {args.query_embeddings}.")
+    else:
+        # Query sampel dikeluarkan dari index dan ground truth; jika tidak, tetangga terdekat
+        # setiap query adalah dirinya sendiri (jarak 0) dan recall@k menjadi terlalu tinggi.
+        rng = np.random.default_rng(args.seed)
+        held_out = np.zeros(data.shape[0], dtype=bool)
+        held_out[rng.choice(data.shape[0], size=min(args.queries, data.shape[0] // 2), replace=False)] = True
+        queries, data = data[held_out], data[~held_out]
+        print(f"{len(queries)} embedding dikeluarkan dari index sebagai query, {len(data)} tersisa untuk index.")
+
+    if data.shape[0] <= args.k or not len(queries):
+        print("Jumlah embedding terlalu sedikit untuk sweep.")
+        return
+
+    results = []
+    for space in args.space:
+        start = time.perf_counter()
+        truth = exact_neighbours(data, queries, args.k, space)
+        print(f"\n[{space}] ground truth brute-force: {(time.perf_counter() - start) * 1000:.1f}ms")
+        for m, construction_ef in itertools.product(args.m, args.construction_ef):
+            index, build_s, index_mb = build_index(data, space, m, construction_ef, args.threads)
+            for search_ef in args.search_ef:
+                row = {"space": space, "M": m, "construction_ef": construction_ef, "search_ef": search_ef,
+                       "build_s": build_s, "index_mb": index_mb}
+                row.update(evaluate(index, queries, truth, args.k, search_ef))
+                results.append(row)
+                print(f"  M={m:<3} construction_ef={construction_ef:<4} search_ef={search_ef:<4} "
+                      f"recall@{args.k}={row['recall_at_k']:.4f}  p50={row['p50_ms']:.3f}ms  "
+                      f"p99={row['p99_ms']:.3f}ms  build={build_s:.2f}s  index={index_mb:.2f}MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"k": args.k, "num_embeddings": int(data.shape[0]), "results": results}, f, indent=2)
+        print(f"\nHasil disimpan ke: {args.output}")
+
+    print("\nSet HNSW_SPACE, HNSW_M, HNSW_CONSTRUCTION_EF dan HNSW_SEARCH_EF di .env, "
+          "lalu jalankan ulang scripts/ingest_data.py.")
+
+
+if __name__ == "__main__":
+    main()